@@ -1,6 +1,8 @@
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -30,6 +32,16 @@ console_handler.setFormatter(
     logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 )
 
+# Loggers only enqueue records, a single listener thread does the writing.
+# Keeps file and console I/O (and their locks) out of the request path.
+log_queue = queue.SimpleQueue()
+queue_handler = QueueHandler(log_queue)
+queue_listener = QueueListener(
+    log_queue, file_handler, console_handler, respect_handler_level=True
+)
+queue_listener.start()
+atexit.register(queue_listener.stop)
+
 
 def get_logger(name, level=logging.INFO):
     """
@@ -46,8 +58,10 @@ def get_logger(name, level=logging.INFO):
     logger.setLevel(level)
 
     if not logger.handlers:
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        logger.addHandler(queue_handler)
+        # The queue handler already writes everything,
+        # propagating would log each record again through the parents.
+        logger.propagate = False
 
     return logger
 
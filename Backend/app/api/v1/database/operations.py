@@ -8,21 +8,31 @@ Check One-line docstrings within the class to see how the refactor will look onc
 """
 
 # External imports
-from sqlalchemy import select, insert, update, delete
-from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, delete, exists, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 from sqlalchemy.exc import IntegrityError
-from psycopg2.errors import UniqueViolation
-from fastapi import HTTPException
+from argon2 import PasswordHasher
+from cachetools import TTLCache
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
+import bcrypt
+from fastapi import Depends, HTTPException
 from typing import Dict, List, Any
 from uuid import UUID
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
 import re
 import uuid
-import bcrypt
 import secrets
 import base64
+import hashlib
 
 # Internal imports
+from app.db_setup import get_db
+from app.settings import settings
 from app.api.logger.loggable import Loggable
 from app.api.v1.database.models import Table
 from app.api.v1.validation.schemas import (
@@ -32,63 +42,116 @@ from app.api.v1.validation.schemas import (
     UserUpdate,
 )
 
+EMAIL_TOKEN_LIFETIME = timedelta(minutes=60)  # As stated in the emails
+
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+
+# Token digest -> user_id, lets most authenticated requests skip the db.
+# user_id -> token digest is kept alongside so logout can evict the entry.
+# Both live per worker process, logout only evicts in the worker serving it.
+# Other workers keep accepting a revoked token until the ttl runs out,
+# so the ttl is kept to a few seconds (TOKEN_CACHE_TTL, 0 disables it).
+_token_cache = TTLCache(maxsize=50_000, ttl=settings.TOKEN_CACHE_TTL)
+_user_token_cache = TTLCache(maxsize=50_000, ttl=settings.TOKEN_CACHE_TTL)
+
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+# Password hashing is CPU-bound, so it gets its own pool off the loop.
+# Threads rather than processes: argon2 and bcrypt both release the GIL,
+# so hashes run in parallel without pickling or extra interpreters.
+# By default the cores are split between the worker processes.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS
+    or max(1, (os.cpu_count() or 1) // settings.worker_count),
+    thread_name_prefix="password-hash",
+)
+
+# Statements for the hottest paths are built once at import.
+# SQLAlchemy caches their compiled SQL, so each call only binds params.
+# Full-row queries, here and below, use raiseload("*") so an accidental
+# relationship access raises instead of silently issuing one query per row.
+_TOKEN_USER_STMT = select(Table.column).where(
+    Table.column == bindparam("token_hash")
+)
+_LOGIN_USER_STMT = (
+    select(Table)
+    .where(Table.column == bindparam("email"))
+    .options(raiseload("*"))
+)
+_USER_PROFILE_STMT = select(
+    Table.column,  # email
+    Table.column,  # first_name
+    Table.column,  # last_name
+    Table.column,  # created_at
+).where(Table.column == bindparam("user_id"))
+
 
 class DatabaseOperations(Loggable):
-    def __init__(self, db: Session):
+    # Argon2id, cost is set in settings so it can be tuned per deployment.
+    # Shared by all instances since the hasher holds no per-request state.
+    _ph = PasswordHasher(
+        time_cost=settings.PASSWORD_TIME_COST,
+        memory_cost=settings.PASSWORD_MEMORY_COST,
+        parallelism=settings.PASSWORD_PARALLELISM,
+    )
+
+    def __init__(self, db: AsyncSession):
         super().__init__()
         self.db = db
-        self.logger.info("Database operations initialized with session")
+        self.logger.debug("Database operations initialized with session")
 
     """
     USER MANAGER
     """
 
-    def create_user(self, token: str) -> Dict[str:str]:
+    async def create_user(self, token: str) -> Dict[str:str]:
         """
         Posts a new user to the database with the information already stored in email_tokens.
 
         Args:
             token[str]: email-authorization token generated from the registration process.
 
-        Raises/Handles:
-            UniqueViolation, IntegrityError:
-                When the code generated UUID already exists in the database. Because why not?
+        Raises:
+            HTTPExc[409]: When the email is already registered,
+                e.g. the link was opened a second time.
 
         Returns:
             access_token[str]: The actual authorization token.
                 This gets stored in the client for future logins.
         """
-        user_data = self._validate_email_token(token)
-        self.logger.info(f"Creating new user: {user_data.email[:10]}...")
-        for attempt in range(3):
-            try:
-                db_user = Table(
+        user_data = await self._validate_email_token(token)
+        self.logger.info("Creating new user: %.10s...", user_data.email)
+        try:
+            stmt = (
+                insert(Table)
+                .values(
                     id=uuid.uuid4(),
                     email=user_data.email,
                     password=user_data.password,
                 )
-                self.db.add(db_user)
-                self.db.commit()
-                self.db.refresh(db_user)
-                break
-            except (UniqueViolation, IntegrityError):
-                self.logger.error(
-                    "Error posting to Users table due to UUID unique constraint. "
-                    "If this happened, reality is a simulation."
-                )
-                if attempt == 2:
-                    raise HTTPException(
-                        status_code=500,
-                        detail="User creation failed when posting to database.",
-                    )
-                continue
-        access_token = self._create_access_token(db_user.id)
+                .returning(Table.column)
+            )
+            result = await self.db.execute(stmt)
+            user_id = result.scalar_one()
+        except IntegrityError:
+            await self.db.rollback()
+            self.logger.warning(
+                "Email already registered: %.10s...", user_data.email
+            )
+            raise HTTPException(
+                status_code=409,
+                detail="Email is already registered",
+            )
+        # Makes link a one-time use, committed with the new user
+        await self.update_email_token(user_data.email, commit=False)
+        access_token = await self._create_access_token(user_id)
         return {"access_token": access_token}
 
-    def login_user(self, user: UserLogin):
+    async def login_user(self, user: UserLogin):
         """
         Logs in a user by creating a new authorization token.
         Activates a user if they are not active.
+        Rehashes the password if the hashing parameters have changed.
 
         Args:
             user[UserLogin]: The users login-data in a pydantic class.
@@ -97,31 +160,45 @@ class DatabaseOperations(Loggable):
             HTTPExc[401] when the credentials are invalid.
             HTTPExc[404] when user is not registered.
         """
-        self.logger.info(f"Logging in user: {user.email[:10]}...")
-        stmt = select(Table).where(Table.column == user.email)
-        result = self.db.execute(stmt)
+        self.logger.info("Logging in user: %.10s...", user.email)
+        result = await self.db.execute(
+            _LOGIN_USER_STMT, {"email": user.email}
+        )
         db_user = result.scalar_one_or_none()
         if db_user is None:
             raise HTTPException(status_code=404, detail="User not found")
-        if not bcrypt.checkpw(
-            user.password.encode("utf-8"), db_user.password.encode("utf-8")
-        ):
+        if not await self._verify_password(db_user.password, user.password):
             raise HTTPException(status_code=401, detail="Invalid credentials")
+        if self._needs_rehash(db_user.password):
+            hashed_pw = await self._hash_password(user.password)
+            stmt = (
+                update(Table)
+                .where(Table.column == db_user.id)
+                .values(password=hashed_pw)
+            )
+            await self.db.execute(stmt)
         if db_user.is_active is False:
-            self.activate_user(db_user.id)
-        token = self._create_access_token(user_id=db_user.id)
+            await self.activate_user(db_user.id, commit=False)
+        token = await self._create_access_token(user_id=db_user.id)
         return token
 
-    def logout_user(self, user_id: UUID):
-        """Logout a user by deleting their active tokens"""
+    async def logout_user(self, user_id: UUID, commit: bool = True):
+        """
+        Logout a user by deleting their active tokens.
+        Pass commit=False to leave the commit to the calling operation.
+        The caller then evicts the cached token again after committing,
+        since a concurrent request can re-cache it until the delete lands.
+        """
         stmt = delete(Table).where(Table.column == user_id)
-        self.db.execute(stmt)
-        self.db.commit()
+        await self.db.execute(stmt)
+        if commit:
+            await self.db.commit()
+        self._evict_cached_token(user_id)
         self.logger.info(
-            f"Removed all tokens for user ID: {str(user_id)[:10]}..."
+            "Removed all tokens for user ID: %.10s...", user_id
         )
 
-    def update_user(self, user_id: UUID, user: UserUpdate):
+    async def update_user(self, user_id: UUID, user: UserUpdate):
         """
         Updates a user in the database.
         If a new password is included it gets hashed.
@@ -141,37 +218,41 @@ class DatabaseOperations(Loggable):
             if value is not None:
                 nud[key] = value
         if "password" in nud:
-            nud["password"] = self._hash_password(nud["password"])
+            nud["password"] = await self._hash_password(nud["password"])
         stmt = (
             update(Table)
             .where(Table.column == user_id)
             .values(**nud)
             .returning(Table)
         )
-        result = self.db.execute(stmt)
+        result = await self.db.execute(stmt)
         updated_user = result.scalar_one_or_none()
-        self.db.commit()
         if updated_user:
+            await self.db.commit()
             return updated_user
         else:
             self.logger.critical(
-                f"Token for user ID: {user_id} passed authorization check "
+                "Token for user ID: %s passed authorization check "
                 "but the user_id does not exist in the database.\n"
-                "Removing all tokens for this user.."
+                "Removing all tokens for this user..",
+                user_id,
             )
-            self.logout_user(user_id)
+            await self.logout_user(user_id, commit=False)
+            await self.db.commit()
+            self._evict_cached_token(user_id)
             raise HTTPException(
                 status_code=404,
                 detail="User not found",
             )
 
-    def activate_user(self, user_id: UUID):
+    async def activate_user(self, user_id: UUID, commit: bool = True):
         """
         Activate a user by setting is_active to True
         This is done when an existing inavtive user logs in.
 
         Args:
             user_id[UUID]: The user id extracted from the authorization decorator.
+            commit[bool]: False leaves the commit to the calling operation.
 
         Raises:
             HTTPExc[404] if the user_id does not exist in db.
@@ -182,22 +263,26 @@ class DatabaseOperations(Loggable):
             .values(is_active=True)
             .returning(Table)
         )
-        result = self.db.execute(stmt)
+        result = await self.db.execute(stmt)
         updated_user = result.scalar_one_or_none()
-        self.db.commit()
         if updated_user is None:
             self.logger.critical(
-                f"Token for user ID: {user_id} passed authorization check "
+                "Token for user ID: %s passed authorization check "
                 "but the user_id does not exist in the database.\n"
-                "Removing all tokens for this user.."
+                "Removing all tokens for this user..",
+                user_id,
             )
-            self.logout_user(user_id)
+            await self.logout_user(user_id, commit=False)
+            await self.db.commit()
+            self._evict_cached_token(user_id)
             raise HTTPException(
                 status_code=404,
                 detail="User not found",
             )
+        if commit:
+            await self.db.commit()
 
-    def deactivate_user(self, user_id: UUID):
+    async def deactivate_user(self, user_id: UUID):
         """
         Deactivates a user by changing their is_active-column to False
 
@@ -207,28 +292,30 @@ class DatabaseOperations(Loggable):
         Raises:
             HTTPExc[404] when a user_id was not found in db.
         """
-        self.logout_user(user_id)
+        await self.logout_user(user_id, commit=False)
         stmt = (
             update(Table)
             .where(Table.column == user_id)
             .values(is_active=False)
             .returning(Table)
         )
-        result = self.db.execute(stmt)
+        result = await self.db.execute(stmt)
         updated_user = result.scalar_one_or_none()
-        self.db.commit()
+        await self.db.commit()
+        self._evict_cached_token(user_id)
         if updated_user is None:
             self.logger.critical(
-                f"A token tied to user ID: {user_id} successfully "
+                "A token tied to user ID: %s successfully "
                 "authenticated access to a protected endpoint (/soft_delete_user). "
-                "But the user with this ID does not exist in the database. "
+                "But the user with this ID does not exist in the database. ",
+                user_id,
             )
             raise HTTPException(
                 status_code=404,
                 detail="User not found",
             )
 
-    def hard_delete_user(self, user_id: UUID):
+    async def hard_delete_user(self, user_id: UUID):
         """
         Hard deletes a user by removing their row from the database
 
@@ -241,69 +328,93 @@ class DatabaseOperations(Loggable):
         Returns:
             Dict[str:str]: Client response on successful deletion.
         """
-        get_stmt = select(Table).where(Table.column == user_id)
-        result = self.db.execute(get_stmt)
-        user = result.scalar_one_or_none()
-        email = user.email
+        get_stmt = select(Table.column).where(Table.column == user_id)
+        result = await self.db.execute(get_stmt)
+        email = result.scalar_one_or_none()
 
-        self.logout_user(user_id)
+        await self.logout_user(user_id, commit=False)
         delete_stmt = delete(Table).where(Table.column == user_id)
-        result = self.db.execute(delete_stmt)
+        result = await self.db.execute(delete_stmt)
         if result.rowcount == 0:
             self.logger.critical(
-                f"A token tied to user ID: {user_id} successfully "
+                "A token tied to user ID: %s successfully "
                 "authenticated access to a protected endpoint (/hard_delete_user). "
-                "But the user with this ID does not exist in the database. "
+                "But the user with this ID does not exist in the database. ",
+                user_id,
             )
+            # Keep the orphan-token cleanup, the dangling token would
+            # otherwise keep passing auth.
+            await self.db.commit()
+            self._evict_cached_token(user_id)
             raise HTTPException(
                 status_code=404,
                 detail="User not found",
             )
-        else:
-            self.db.commit()
-            self.logger.info(
-                f"Successfully deleted user ID: {str(user_id)[:10]}..."
-            )
-        self._delete_email_tokens(email)
+        await self._delete_email_tokens([email], commit=False)
+        await self.db.commit()
+        self._evict_cached_token(user_id)
+        self.logger.info(
+            "Successfully deleted user ID: %.10s...", user_id
+        )
         return {"message": "User deleted successfully"}
 
     def _validate_email(self, email: str) -> bool:
         """Validates email format. Returns True if valid."""
-        self.logger.debug(f"Validating email format: {email[:5]}...")
-        email_pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        is_valid = re.match(email_pattern, email)
-        return bool(is_valid)
+        self.logger.debug("Validating email format: %.5s...", email)
+        return _EMAIL_RE.match(email) is not None
 
-    def _check_existing_user(self, email: str) -> bool:
+    async def _check_existing_user(self, email: str) -> bool:
         """Checks if an email is registered. Returns True if user exists."""
-        self.logger.debug(f"Checking if email: {email[:5]} exists...")
-        stmt = select(Table).where(Table.column == email)
-        result = self.db.execute(stmt)
-        existing_user = result.scalar_one_or_none()
-        return bool(existing_user)
+        self.logger.debug("Checking if email: %.5s exists...", email)
+        stmt = select(exists().where(Table.column == email))
+        result = await self.db.execute(stmt)
+        return bool(result.scalar())
 
     """
     TOKEN MANAGER
     """
 
     def generate_token(self) -> str:
-        return "Wouldn't you like to know!"
+        """Generates a url-safe token from 32 random bytes"""
+        raw = secrets.token_bytes(32)
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
 
-    def _create_access_token(self, user_id: UUID) -> str:
-        """Generates a new authorization token for a user and deletes all their previous tokens"""
+    def _hash_token(self, token: str) -> bytes:
+        """
+        Returns the SHA-256 digest of a token.
+        Access tokens are only stored as digests, which keeps the index on
+        fixed-width 32-byte keys and makes a leaked db dump useless for login.
+        """
+        return hashlib.sha256(token.encode()).digest()
+
+    async def _create_access_token(self, user_id: UUID) -> str:
+        """Generates a new authorization token for a user and replaces their previous one"""
         self.logger.debug(
-            f"Creating access token for user ID: {str(user_id)[:10]}..."
+            "Creating access token for user ID: %.10s...", user_id
         )
-        self.logout_user(user_id)
         token = self.generate_token()
+        token_hash = self._hash_token(token)
         expires_at = "some unknown timestamp"
-        db_token = Table(token=token, expires_at=expires_at, user_id=user_id)
-        self.db.add(db_token)
-        self.db.commit()
-        self.db.refresh(db_token)
+        # One active token per user (uq_access_token_user_id in db_setup),
+        # so an existing row is overwritten instead of deleted and reinserted.
+        stmt = (
+            pg_insert(Table)
+            .values(
+                token_hash=token_hash,
+                expires_at=expires_at,
+                user_id=user_id,
+            )
+            .on_conflict_do_update(
+                index_elements=["user_id"],
+                set_=dict(token_hash=token_hash, expires_at=expires_at),
+            )
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+        self._evict_cached_token(user_id)
         return token
 
-    def validate_token(self, token: str) -> UUID:
+    async def validate_token(self, token: str) -> UUID:
         """
         Validates an authorization token and returns the user_id
 
@@ -316,23 +427,35 @@ class DatabaseOperations(Loggable):
         Returns:
             user_id[UUID]: If the token exists in db.
         """
-        self.logger.info(f"Validating user token: {token[:10]}...")
-        stmt = select(Table).where(Table.column == token)
-        result = self.db.execute(stmt)
-        token_data = result.scalar_one_or_none()
-        if not token_data:
+        self.logger.debug("Validating user token: %.10s...", token)
+        token_hash = self._hash_token(token)
+        user_id = _token_cache.get(token_hash)
+        if user_id is not None:
+            return user_id
+        result = await self.db.execute(
+            _TOKEN_USER_STMT, {"token_hash": token_hash}
+        )
+        user_id = result.scalar_one_or_none()
+        if not user_id:
             raise HTTPException(
                 status_code=401,
                 detail="Invalid token",
             )
         else:
-            user_id = token_data.user_id
-            self.logger.info(
-                f"Token validated for user: {str(user_id)[:10]}..."
+            _token_cache[token_hash] = user_id
+            _user_token_cache[user_id] = token_hash
+            self.logger.debug(
+                "Token validated for user: %.10s...", user_id
             )
             return user_id
 
-    def create_email_token(self, user: UserCreate) -> str:
+    def _evict_cached_token(self, user_id: UUID):
+        """Removes a user's token from the validation cache"""
+        token_hash = _user_token_cache.pop(user_id, None)
+        if token_hash is not None:
+            _token_cache.pop(token_hash, None)
+
+    async def create_email_token(self, user: UserCreate) -> str:
         """
         Stores user data and new token in email_tokens on account registration.
         In the case where a user tries to register an account several times
@@ -352,49 +475,62 @@ class DatabaseOperations(Loggable):
                 status_code=400,
                 detail="Invalid email format",
             )
-        if self._check_existing_user(user.email):
+        # Hashed before touching the db,
+        # so no connection or transaction is held while it runs.
+        hashed_pw = await self._hash_password(user.password)
+        if await self._check_existing_user(user.email):
             raise HTTPException(
                 status_code=400,
                 detail="User with this email already exists",
             )
-        try:
-            token = self._post_email_token(user)
-        except (UniqueViolation, IntegrityError):
-            # If the user registers again before activating the old link.
-            self.db.rollback()
-            self._delete_email_tokens(email=user.email)
-            token = self._post_email_token(user)
+        token = await self._post_email_token(user.email, hashed_pw)
         return token
 
-    def _post_email_token(self, user: UserCreate) -> str:
+    async def _post_email_token(self, email: str, hashed_pw: str) -> str:
         """
-        Creates a new email-token row for a user
+        Creates or replaces the email-token row for a user.
+        If the user registers again before activating the old link,
+        the old token is overwritten, concurrent registrations included.
 
         Args:
-            user[UserCreate]: Pydantic model for user creation data.
+            email[str]: The users email address
+            hashed_pw[str]: The already hashed password.
 
         Returns:
             token[str]: The email token user in account registration-link.
         """
-        hashed_pw = self._hash_password(user.password)
         token = self.generate_token()
-        stmt = insert(Table).values(
-            email=user.email,
-            password=hashed_pw,
-            token=token,
+        stmt = (
+            pg_insert(Table)
+            .values(
+                email=email,
+                password=hashed_pw,
+                token=token,
+            )
+            .on_conflict_do_update(
+                index_elements=["email"],
+                set_=dict(
+                    password=hashed_pw,
+                    token=token,
+                    created_at=datetime.now(),
+                ),
+            )
         )
-        self.db.execute(stmt)
-        self.db.commit()
+        await self.db.execute(stmt)
+        await self.db.commit()
 
         return token
 
-    def _delete_email_tokens(self, email: str):
-        """Deletes all emaikl-tokens for an email"""
-        stmt = delete(Table).where(Table.column == email)
-        self.db.execute(stmt)
-        self.db.commit()
+    async def _delete_email_tokens(
+        self, emails: List[str], commit: bool = True
+    ):
+        """Deletes all email-tokens for a batch of emails in one statement"""
+        stmt = delete(Table).where(Table.column.in_(emails))
+        await self.db.execute(stmt)
+        if commit:
+            await self.db.commit()
 
-    def _validate_email_token(self, token: str) -> Table:
+    async def _validate_email_token(self, token: str) -> Table:
         """
         Checks if an email-token exists in the database.
         This method is used when the user clicks the link to activate their account.
@@ -406,23 +542,34 @@ class DatabaseOperations(Loggable):
             HTTPExc[401]: If the token has expired
             HTTPExc[404]: If the token doesn't exist in the db.
         """
-        stmt = select(Table).where(Table.column == token)
-        result = self.db.execute(stmt)
+        cutoff = datetime.now() - EMAIL_TOKEN_LIFETIME
+        stmt = (
+            select(Table)
+            .where(Table.column == token, Table.column >= cutoff)
+            .options(raiseload("*"))
+        )
+        result = await self.db.execute(stmt)
         user = result.scalar_one_or_none()
-        if not user:
+        if user:
+            return user
+        # Only reached on failure, tells an expired token from a missing one
+        stmt = select(Table.column).where(Table.column == token)
+        result = await self.db.execute(stmt)
+        email = result.scalar_one_or_none()
+        if not email:
             raise HTTPException(status_code=404, detail="Token not found")
-        if "The token timestamp is too old":
-            self._delete_email_tokens(user.email)
-            raise HTTPException(status_code=401, detail="Token expired")
-        return user
+        # The row is kept, password resets rotate it in place.
+        # The next upsert for this email overwrites the expired token.
+        raise HTTPException(status_code=401, detail="Token expired")
 
-    def update_email_token(self, email: str) -> str:
+    async def update_email_token(self, email: str, commit: bool = True) -> str:
         """
         Generates and changes the email-token for a user
         This is used when the user wants to reset their password.
 
         Args:
             email[str]: The users email address
+            commit[bool]: False when called as part of a larger transaction.
 
         Raises:
             HTTPExc[404]: When the email is not in the database
@@ -430,9 +577,11 @@ class DatabaseOperations(Loggable):
         Returns:
             new_token[str]: The new email-token
         """
-        self.logger.info(f"Updating email token for user: {email[:5]}...")
-        stmt = select(Table).where(Table.column == email)
-        result = self.db.execute(stmt)
+        self.logger.info("Updating email token for user: %.5s...", email)
+        stmt = (
+            select(Table).where(Table.column == email).options(raiseload("*"))
+        )
+        result = await self.db.execute(stmt)
         token_data = result.scalar_one_or_none()
         if not token_data:
             raise HTTPException(status_code=404, detail="Email not registered")
@@ -445,39 +594,84 @@ class DatabaseOperations(Loggable):
                 created_at=datetime.now(),
             )
         )
-        self.db.execute(stmt)
-        self.db.commit()
+        await self.db.execute(stmt)
+        if commit:
+            await self.db.commit()
         return new_token
 
-    def reset_password(self, token: str, password: str):
+    async def reset_password_and_issue_token(
+        self, token: str, password: str
+    ) -> str:
         """
-        Changes a user's password.
+        Changes a user's password and logs them in.
         Used when user requests a password reset.
+        Everything is committed together with the new access token.
 
         Args:
             token[str]: The email-token from the reset-link.
             password[str]: The users new password
+
+        Raises:
+            HTTPExc[404]: When no user is registered with the token's email.
+
+        Returns:
+            access_token[str]: The new authorization token.
         """
-        user_data = self._validate_email_token(token)
-        hashed_pw = self._hash_password(password)
+        user_data = await self._validate_email_token(token)
+        hashed_pw = await self._hash_password(password)
+        # Activates the user like a regular login would
         stmt = (
             update(Table)
             .where(Table.column == user_data.email)
-            .values(password=hashed_pw)
+            .values(password=hashed_pw, is_active=True)
+            .returning(Table.column)  # id
+        )
+        result = await self.db.execute(stmt)
+        user_id = result.scalar_one_or_none()
+        if user_id is None:
+            await self.db.rollback()
+            raise HTTPException(status_code=404, detail="User not found")
+        # Makes link a one-time use
+        await self.update_email_token(user_data.email, commit=False)
+        return await self._create_access_token(user_id=user_id)
+
+    async def _hash_password(self, password: str) -> str:
+        """Hashes a password with Argon2id. Returns the encoded hash."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _hash_executor, self._ph.hash, password
         )
-        self.db.execute(stmt)
-        self.db.commit()
-        self.update_email_token(user_data.email)  # Makes link a one-time use
-        return user_data
 
-    def _hash_password(self, password: str) -> str:
-        return "Super secret"
+    async def _verify_password(self, hashed_pw: str, password: str) -> bool:
+        """Verifies a password against its hash. Returns True on match."""
+        loop = asyncio.get_running_loop()
+        if hashed_pw.startswith(_BCRYPT_PREFIXES):
+            # Accounts created before the switch to Argon2.
+            # Rehashed on their next successful login.
+            return await loop.run_in_executor(
+                _hash_executor,
+                bcrypt.checkpw,
+                password.encode("utf-8"),
+                hashed_pw.encode("ascii"),
+            )
+        try:
+            return await loop.run_in_executor(
+                _hash_executor, self._ph.verify, hashed_pw, password
+            )
+        except (VerifyMismatchError, InvalidHashError):
+            return False
+
+    def _needs_rehash(self, hashed_pw: str) -> bool:
+        """Checks if a hash is bcrypt or uses outdated Argon2 parameters."""
+        if hashed_pw.startswith(_BCRYPT_PREFIXES):
+            return True
+        return self._ph.check_needs_rehash(hashed_pw)
 
     """
     GAME MANAGER
     """
 
-    def get_start_story(self, story_id: str):
+    async def get_start_story(self, story_id: str):
         """
         Retrieves a starting story from the database
 
@@ -490,14 +684,18 @@ class DatabaseOperations(Loggable):
         Returns:
             Dict[str:str]: The client response including the requested story.
         """
-        self.logger.info(f"Getting story with ID: {story_id}")
+        self.logger.info("Getting story with ID: %s", story_id)
 
-        stmt = select(Table).where(Table.column == story_id)
-        result = self.db.execute(stmt)
+        stmt = (
+            select(Table)
+            .where(Table.column == story_id)
+            .options(raiseload("*"))
+        )
+        result = await self.db.execute(stmt)
         starting_story = result.scalar_one_or_none()
 
         if starting_story.story is None or starting_story.image is None:
-            self.logger.error(f"Story with ID {story_id} not found")
+            self.logger.error("Story with ID %s not found", story_id)
             raise HTTPException(
                 status_code=404,
                 detail=f"Story with ID {story_id} not found",
@@ -508,7 +706,7 @@ class DatabaseOperations(Loggable):
             "id": starting_story.id,
         }
 
-    def load_game(self, user_id: str):
+    async def load_game(self, user_id: str):
         """
         Gets all game sessions from a user
 
@@ -518,25 +716,32 @@ class DatabaseOperations(Loggable):
         Returns:
             response_data[List[Dict]]: All game sessions
         """
-        stmt = select(Table).where(Table.column == user_id)
-        result = self.db.execute(stmt)
-        all_saves: List[Table] = result.scalars().all()
-        response_data = []
-        for save in all_saves:
-            response_data.append(
-                {
-                    "id": save.id,
-                    "protagonist_name": save.protagonist_name,
-                    "inventory": save.inventory,
-                    "session_name": save.session_name,
-                    "stories": save.stories,
-                    "image": save.last_image,
-                    "last_played": save.updated_at,
-                }
-            )
+        stmt = select(
+            Table.column,  # id
+            Table.column,  # protagonist_name
+            Table.column,  # inventory
+            Table.column,  # session_name
+            Table.column,  # stories
+            Table.column,  # last_image
+            Table.column,  # updated_at
+        ).where(Table.column == user_id)
+        # Streams the saves in batches instead of buffering every row first
+        result = await self.db.stream(stmt.execution_options(yield_per=200))
+        response_data = [
+            {
+                "id": save.id,
+                "protagonist_name": save.protagonist_name,
+                "inventory": save.inventory,
+                "session_name": save.session_name,
+                "stories": save.stories,
+                "image": save.last_image,
+                "last_played": save.updated_at,
+            }
+            async for save in result
+        ]
         return response_data
 
-    def get_user_profile(self, user_id: UUID) -> Dict[str, Any]:
+    async def get_user_profile(self, user_id: UUID) -> Dict[str, Any]:
         """
         Gets a user's profile information
 
@@ -549,9 +754,10 @@ class DatabaseOperations(Loggable):
         Returns:
             Dict[str:str]: The relevant user data.
         """
-        stmt = select(Table).where(Table.column == user_id)
-        result = self.db.execute(stmt)
-        user = result.scalar_one_or_none()
+        result = await self.db.execute(
+            _USER_PROFILE_STMT, {"user_id": user_id}
+        )
+        user = result.one_or_none()
 
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -567,7 +773,7 @@ class DatabaseOperations(Loggable):
             "registered_at": created_date,
         }
 
-    def save_game_route(self, data: SaveGame, user_id):
+    async def save_game_route(self, data: SaveGame, user_id):
         """
         Routes a game session to be saved in either a new or existing db row.
 
@@ -592,17 +798,12 @@ class DatabaseOperations(Loggable):
                 )
                 .returning(Table.column)
             )
-            result = self.db.execute(stmt)
+            result = await self.db.execute(stmt)
             game_id = result.scalar_one()
 
         # Saving to an existing row
+        # Appends the new scenes in SQL so stored scenes never leave the db
         else:
-            existing_stmt = select(Table.column).where(
-                Table.column == data.game_session.id
-            )
-            result = self.db.execute(existing_stmt)
-            old_scenes = result.scalar_one_or_none()
-            updated_scenes = old_scenes + data.game_session.scenes
             stmt = (
                 update(Table)
                 .where(Table.column == data.game_session.id)
@@ -610,12 +811,20 @@ class DatabaseOperations(Loggable):
                     last_image=data.image,
                     session_name=data.game_session.session_name,
                     inventory=data.game_session.inventory,
-                    stories=updated_scenes,
+                    stories=Table.column.op("||")(data.game_session.scenes),
                 )
             )
-            self.db.execute(stmt)
+            await self.db.execute(stmt)
             game_id = data.game_session.id
 
-        self.db.commit()
+        await self.db.commit()
 
         return game_id
+
+
+def get_db_ops(db: AsyncSession = Depends(get_db)) -> DatabaseOperations:
+    """
+    Dependency that builds one DatabaseOperations per request.
+    Shares the request's session since FastAPI caches get_db per request.
+    """
+    return DatabaseOperations(db)
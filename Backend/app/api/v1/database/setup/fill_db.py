@@ -3,9 +3,10 @@ Script for filling the database with neccesary starting-data.
 """
 
 # External imports
+import asyncio
 from fastapi import Depends
 from app.db_setup import get_db
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import insert, text
 
 # Internal imports
@@ -18,25 +19,25 @@ from app.api.v1.database.models import (
 )
 
 
-def fill_db(session: Session = Depends(get_db)):
-    categories(session)
-    session.commit()
+async def fill_db(session: AsyncSession = Depends(get_db)):
+    await categories(session)
+    await session.commit()
 
-    starting_stories(session)
-    session.commit()
+    await starting_stories(session)
+    await session.commit()
 
-    reviews(session)
-    session.commit()
+    await reviews(session)
+    await session.commit()
 
-    payment_methods(session)
-    session.commit()
+    await payment_methods(session)
+    await session.commit()
 
     print("All data has been successfully inserted!")
 
 
-def categories(session: Session):
+async def categories(session: AsyncSession):
     print("Inserting categories...")
-    session.execute(
+    await session.execute(
         text("TRUNCATE adventure_categories RESTART IDENTITY CASCADE")
     )
 
@@ -46,12 +47,12 @@ def categories(session: Session):
         {"name": "Science Fiction"},
     ]
     for category in categories:
-        session.execute(insert(AdventureCategories).values(**category))
-    session.flush()
+        await session.execute(insert(AdventureCategories).values(**category))
+    await session.flush()
     print("Categories inserted successfully")
 
 
-def starting_stories(session: Session):
+async def starting_stories(session: AsyncSession):
     print("Inserting starting stories...")
     stories = [
         {
@@ -85,14 +86,16 @@ A section of wall buckled inward with a tortured screech of metal. Behind it, yo
         },
     ]
     for story in stories:
-        session.execute(insert(StartingStories).values(**story))
-    session.flush()
+        await session.execute(insert(StartingStories).values(**story))
+    await session.flush()
     print("Starting stories inserted successfully")
 
 
-def reviews(session: Session):
+async def reviews(session: AsyncSession):
     print("Inserting reviews...")
-    user_result = session.execute(text("SELECT id FROM users")).fetchall()
+    user_result = (
+        await session.execute(text("SELECT id FROM users"))
+    ).fetchall()
     user_ids = [row[0] for row in user_result]
 
     if not user_ids:
@@ -120,16 +123,18 @@ def reviews(session: Session):
         )
 
     for review in reviews:
-        session.execute(insert(Reviews).values(**review))
+        await session.execute(insert(Reviews).values(**review))
 
-    session.flush()
+    await session.flush()
     print("Reviews inserted successfully")
 
 
-def payment_methods(session: Session):
+async def payment_methods(session: AsyncSession):
     print("Inserting payment methods...")
     # First clear existing data if any
-    session.execute(text("TRUNCATE payment_methods RESTART IDENTITY CASCADE"))
+    await session.execute(
+        text("TRUNCATE payment_methods RESTART IDENTITY CASCADE")
+    )
 
     methods = [
         {"name": "Credit Card"},
@@ -138,21 +143,22 @@ def payment_methods(session: Session):
         {"name": "Bank Transfer"},
     ]
     for method in methods:
-        session.execute(insert(PaymentMethods).values(**method))
+        await session.execute(insert(PaymentMethods).values(**method))
 
-    session.flush()
+    await session.flush()
     print("Payment methods inserted successfully")
 
 
-if __name__ == "__main__":
-    from app.db_setup import get_db
+async def main():
+    from app.db_setup import SessionManager
 
-    session = next(get_db())
     try:
-        fill_db(session=session)
+        async with SessionManager() as session:
+            await fill_db(session=session)
         print("Database filled with dummy data successfully!")
     except Exception as e:
-        session.rollback()
         print(f"Error filling database: {str(e)}")
-    finally:
-        session.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,19 +1,20 @@
 # External imports
 from functools import wraps
-from typing import Callable, Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any, List
 import time
-from datetime import datetime
 from fastapi import HTTPException, Request, status, Depends, Security
 from fastapi.responses import JSONResponse
 from fastapi.security import APIKeyHeader
-from sqlalchemy import select, update
-from sqlalchemy.orm import Session
+from starlette.routing import BaseRoute, Match
+from sqlalchemy import Integer, case, cast, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 # Internal imports
 from app.api.logger.logger import get_logger
 from app.api.v1.database.models import RateLimit
-from app.db_setup import get_db
+from app.db_setup import get_db, SessionManager
 from app.api.v1.endpoints.token_validation import (
     get_token,
     validate_token,
@@ -60,13 +61,15 @@ def get_rate_limit_key(
         }
 
 
-def check_and_update_rate_limit(
-    db: Session, key: Dict[str, Any], limit: int, window_seconds: int = 60
+async def check_and_update_rate_limit(
+    db: AsyncSession, key: Dict[str, Any], limit: int, window_seconds: int = 60
 ) -> Dict[str, Any]:
     """
     Checks if a request exceeds the rate limit and updates the database.
-    This function handles cleaning up old timestamps and adding the new timestamp
-    if the request is under the limit.
+    Runs as a single INSERT ... ON CONFLICT DO UPDATE so concurrent requests
+    for the same key are serialized on the row instead of overwriting
+    each other's timestamps. Timestamps older than the window are dropped
+    and the new one is only added if the request is under the limit.
 
     Args:
         db: Database session
@@ -83,68 +86,99 @@ def check_and_update_rate_limit(
     """
     current_time = int(time.time())
     cutoff_time = current_time - window_seconds
+
     if key["user_id"]:
-        stmt = select(RateLimit).where(
-            RateLimit.user_id == key["user_id"],
-            RateLimit.endpoint_path == key["endpoint_path"],
-        )
+        conflict_column, key_value = RateLimit.user_id, key["user_id"]
     else:
-        stmt = select(RateLimit).where(
-            RateLimit.ip_address == key["ip_address"],
+        conflict_column, key_value = RateLimit.ip_address, key["ip_address"]
+
+    # The stored row as it was before this request. FOR UPDATE makes the
+    # read wait for concurrent requests and see their committed timestamps.
+    previous = (
+        select(RateLimit.requests)
+        .where(
+            conflict_column == key_value,
             RateLimit.endpoint_path == key["endpoint_path"],
         )
-
-    result = db.execute(stmt)
-    rate_limit_record = result.scalar_one_or_none()
-
-    if rate_limit_record:
-        valid_timestamps = [
-            ts for ts in rate_limit_record.requests if ts > cutoff_time
-        ]
-        if len(valid_timestamps) >= limit:
-            if valid_timestamps:
-                oldest_timestamp = min(valid_timestamps)
-                reset_time = oldest_timestamp + window_seconds - current_time
-            else:
-                reset_time = window_seconds
-
-            return {
-                "exceeded": True,
-                "reset_time": max(1, int(reset_time)),
-                "total": limit,
-                "remaining": 0,
-            }
-        valid_timestamps.append(current_time)
-        stmt = (
-            update(RateLimit)
-            .where(RateLimit.id == rate_limit_record.id)
-            .values(requests=valid_timestamps, updated_at=datetime.now())
-        )
-        db.execute(stmt)
-        db.commit()
-
-        return {
-            "exceeded": False,
-            "reset_time": window_seconds,
-            "total": limit,
-            "remaining": limit - len(valid_timestamps),
-        }
-    else:
-        new_record = RateLimit(
+        .with_for_update()
+        .cte("previous")
+    )
+    previous_ts = func.unnest(previous.c.requests).column_valued("ts")
+    request_count = (
+        select(func.count())
+        .select_from(previous)
+        .where(previous_ts > cutoff_time)
+        .scalar_subquery()
+    )
+    oldest = (
+        select(func.min(previous_ts))
+        .select_from(previous)
+        .where(previous_ts > cutoff_time)
+        .scalar_subquery()
+    )
+    # Decided once from the count before the update,
+    # both the SET and RETURNING use this same flag.
+    allowed = request_count < limit
+
+    # The existing row's timestamps that are still inside the window
+    ts = func.unnest(RateLimit.requests).column_valued("ts")
+    valid_timestamps = (
+        select(func.coalesce(func.array_agg(ts), cast([], ARRAY(Integer))))
+        .where(ts > cutoff_time)
+        .scalar_subquery()
+    )
+
+    stmt = (
+        pg_insert(RateLimit)
+        .add_cte(previous)
+        .values(
             user_id=key["user_id"],
             ip_address=key["ip_address"],
             endpoint_path=key["endpoint_path"],
             requests=[current_time],
+            updated_at=func.now(),
         )
-        db.add(new_record)
-        db.commit()
-
+        .on_conflict_do_update(
+            index_elements=[conflict_column, RateLimit.endpoint_path],
+            index_where=conflict_column.isnot(None),
+            set_={
+                "requests": case(
+                    (
+                        allowed,
+                        func.array_append(valid_timestamps, current_time),
+                    ),
+                    else_=valid_timestamps,
+                ),
+                "updated_at": case(
+                    (allowed, func.now()), else_=RateLimit.updated_at
+                ),
+            },
+        )
+        .returning(
+            allowed.label("allowed"),
+            request_count.label("request_count"),
+            oldest.label("oldest"),
+        )
+    )
+    result = await db.execute(stmt)
+    row = result.one()
+    await db.commit()
+
+    if not row.allowed:
+        oldest_timestamp = row.oldest or current_time
+        reset_time = oldest_timestamp + window_seconds - current_time
         return {
-            "exceeded": False,
-            "reset_time": window_seconds,
+            "exceeded": True,
+            "reset_time": max(1, int(reset_time)),
             "total": limit,
-            "remaining": limit - 1,
+            "remaining": 0,
         }
+    return {
+        "exceeded": False,
+        "reset_time": window_seconds,
+        "total": limit,
+        "remaining": max(0, limit - row.request_count - 1),
+    }
 
 
 def create_rate_limiter(
@@ -160,7 +194,7 @@ def create_rate_limiter(
     @router.get("/public-endpoint")
     async def public_endpoint(
         request: Request,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         _: None = Depends(create_rate_limiter(100, 20))
     ):
         return {"message": "Rate-limited endpoint"}
@@ -176,7 +210,7 @@ def create_rate_limiter(
 
     async def rate_limiter(
         request: Request,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         auth_header: Optional[str] = Security(authorization_header),
     ):
         user_id = None
@@ -184,13 +218,13 @@ def create_rate_limiter(
             if auth_header:
                 token = get_token(auth_header, None)
                 if token:
-                    user_id = validate_token(token, db, get_id=True)
+                    user_id = await validate_token(token, db, get_id=True)
                     request.state.user_id = user_id
         except Exception as e:
             logger.warning(f"Authentication check failed: {str(e)}")
         limit = authenticated_limit if user_id else unauthenticated_limit
         rate_limit_key = get_rate_limit_key(request, user_id)
-        rate_limit_info = check_and_update_rate_limit(
+        rate_limit_info = await check_and_update_rate_limit(
             db=db,
             key=rate_limit_key,
             limit=limit,
@@ -232,7 +266,7 @@ def create_authenticated_rate_limiter(
     @requires_auth(get_id=True)
     async def user_endpoint(
         request: Request,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         token: str = Depends(get_token),
         user_id: UUID = None,
         _: None = Depends(create_authenticated_rate_limiter(100))
@@ -249,7 +283,7 @@ def create_authenticated_rate_limiter(
 
     async def auth_rate_limiter(
         request: Request,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
     ):
         user_id = getattr(request.state, "user_id", None)
 
@@ -258,7 +292,7 @@ def create_authenticated_rate_limiter(
                 "No user_id found in request state. This rate limiter should be used after authentication."
             )
         rate_limit_key = get_rate_limit_key(request, user_id)
-        rate_limit_info = check_and_update_rate_limit(
+        rate_limit_info = await check_and_update_rate_limit(
             db=db,
             key=rate_limit_key,
             limit=authenticated_limit,
@@ -321,7 +355,7 @@ def rate_limit(
     Example:
         @router.get("/public-endpoint")
         @rate_limit(authenticated_limit=100, unauthenticated_limit=20)
-        async def public_endpoint(request: Request, db: Session = Depends(get_db)):
+        async def public_endpoint(request: Request, db: AsyncSession = Depends(get_db)):
             return {"message": "This is a public endpoint"}
 
     Args:
@@ -336,7 +370,10 @@ def rate_limit(
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(
-            request: Request, db: Session = Depends(get_db), *args, **kwargs
+            request: Request,
+            db: AsyncSession = Depends(get_db),
+            *args,
+            **kwargs,
         ):
             rate_limiter = create_rate_limiter(
                 authenticated_limit, unauthenticated_limit, window_seconds
@@ -378,7 +415,7 @@ def optimized_rate_limit_with_auth(
         @optimized_rate_limit_with_auth(authenticated_limit=100)
         async def protected_endpoint(
             request: Request,
-            db: Session = Depends(get_db),
+            db: AsyncSession = Depends(get_db),
             token: str = Depends(get_token),
             user_id: UUID = None,
         ):
@@ -395,7 +432,10 @@ def optimized_rate_limit_with_auth(
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(
-            request: Request, db: Session = Depends(get_db), *args, **kwargs
+            request: Request,
+            db: AsyncSession = Depends(get_db),
+            *args,
+            **kwargs,
         ):
             user_id = kwargs.get("user_id")
             request.state.user_id = user_id
@@ -421,9 +461,139 @@ def optimized_rate_limit_with_auth(
     return decorator
 
 
+class RateLimitMiddleware:
+    """
+    ASGI middleware that rate limits every routed http request.
+    Replaces the per-endpoint decorators with one check per request,
+    keyed on user id when the request carries a valid token, otherwise on IP,
+    and on the matched route's path template (so /verify/{token} is one
+    bucket no matter the token). Requests that match no route are passed
+    through untouched, they never create a rate limit row.
+
+    The database session is released before the request is passed on,
+    so a request never holds two connections at once.
+    A validated user id is left in request.state.user_id for requires_auth.
+
+    This should be added to your FastAPI app:
+
+    app.add_middleware(
+        RateLimitMiddleware, routes=app.routes, authenticated_limit=100
+    )
+
+    Args:
+        app: The wrapped ASGI application
+        routes: The application's routes, used to find the path template
+        authenticated_limit: Maximum requests per window for authenticated users
+        unauthenticated_limit: Maximum requests per window for unauthenticated users
+        window_seconds: Time window in seconds (default: 60)
+    """
+
+    def __init__(
+        self,
+        app,
+        routes: List[BaseRoute],
+        authenticated_limit: int = 100,
+        unauthenticated_limit: int = 20,
+        window_seconds: int = 60,
+    ):
+        self.app = app
+        self.routes = routes
+        self.authenticated_limit = authenticated_limit
+        self.unauthenticated_limit = unauthenticated_limit
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope, receive, send):
+        # CORS preflights are answered by the outer middleware
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        endpoint_path = self._get_route_path(scope)
+        if endpoint_path is None:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        async with SessionManager() as db:
+            user_id = await self._get_user_id(request, db)
+            if user_id:
+                # Stored in scope["state"], requires_auth reuses it
+                # instead of validating the same token again.
+                request.state.user_id = user_id
+            limit = (
+                self.authenticated_limit
+                if user_id
+                else self.unauthenticated_limit
+            )
+            rate_limit_info = await check_and_update_rate_limit(
+                db=db,
+                key=get_rate_limit_key(request, user_id, endpoint_path),
+                limit=limit,
+                window_seconds=self.window_seconds,
+            )
+
+        if rate_limit_info["exceeded"]:
+            reset_time = rate_limit_info["reset_time"]
+            response = JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"detail": "Rate limit exceeded"},
+                headers={
+                    "Retry-After": str(reset_time),
+                    "X-RateLimit-Limit": str(limit),
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": str(int(time.time() + reset_time)),
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        rate_limit_headers = [
+            (b"x-ratelimit-limit", str(limit).encode()),
+            (
+                b"x-ratelimit-remaining",
+                str(rate_limit_info["remaining"]).encode(),
+            ),
+            (
+                b"x-ratelimit-reset",
+                str(int(time.time() + self.window_seconds)).encode(),
+            ),
+        ]
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = (
+                    list(message.get("headers", [])) + rate_limit_headers
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def _get_route_path(self, scope) -> Optional[str]:
+        """Returns the path template of the matching route, otherwise None"""
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return None
+
+    async def _get_user_id(
+        self, request: Request, db: AsyncSession
+    ) -> Optional[UUID]:
+        """Returns the user id for a valid bearer token, otherwise None"""
+        auth_header = request.headers.get("authorization")
+        if not auth_header:
+            return None
+        try:
+            token = get_token(auth_header, None)
+            return await validate_token(token, db, get_id=True)
+        except Exception as e:
+            logger.warning(f"Authentication check failed: {str(e)}")
+            return None
+
+
 async def example_public_endpoint_with_dependency(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: None = Depends(create_rate_limiter(50, 5)),
 ):
     """This is a test endpoint demonstrating rate limiting with dependencies."""
@@ -432,7 +602,7 @@ async def example_public_endpoint_with_dependency(
 
 @rate_limit(authenticated_limit=50, unauthenticated_limit=5)
 async def example_public_endpoint(
-    request: Request, db: Session = Depends(get_db)
+    request: Request, db: AsyncSession = Depends(get_db)
 ):
     """This is a test endpoint demonstrating rate limiting with decorators."""
     return {"message": "Hello, world!"}
@@ -10,7 +10,7 @@ from functools import wraps
 
 # Internal imports
 from app.api.logger.logger import get_logger
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.v1.database.operations import DatabaseOperations
 
 
@@ -18,14 +18,22 @@ security = HTTPBearer()
 logger = get_logger("app.api.endpoints.token_validation")
 
 
-def validate_token(token: str, db: Session, get_id: bool = False):
-    """Validates the token and optionally returns the user id"""
+async def validate_token(
+    token: str,
+    db: AsyncSession,
+    get_id: bool = False,
+    ops: Optional[DatabaseOperations] = None,
+):
+    """
+    Validates the token and optionally returns the user id.
+    Reuses the endpoint's DatabaseOperations when one is passed.
+    """
     logger.info("Validating token")
-    user_id = DatabaseOperations(db).validate_token(token)
+    if ops is None:
+        ops = DatabaseOperations(db)
+    user_id = await ops.validate_token(token)
     if get_id:
-        logger.info(
-            f"Token validated, returning user id: {str(user_id)[:5]}..."
-        )
+        logger.info("Token validated, returning user id: %.5s...", user_id)
         return user_id
     else:
         logger.info("Token validated")
@@ -53,6 +61,9 @@ def get_token(
 def requires_auth(get_id: bool = False):
     """
     A simple decorator that handles token validation inside the endpoint.
+    Reuses the user id RateLimitMiddleware already validated for this
+    request, and only checks the token itself when there is none.
+    The check uses the endpoint's ops, or its db session when it has no ops.
 
     Args:
         get_id: If True, the user_id will be returned and passed to the function.
@@ -63,7 +74,13 @@ def requires_auth(get_id: bool = False):
         async def wrapper(*args, **kwargs):
             token = kwargs.get("token")
             db = kwargs.get("db")
-            user_id = validate_token(token, db, get_id=True)
+            ops = kwargs.get("ops")
+            request = kwargs.get("request")
+            user_id = None
+            if request is not None:
+                user_id = getattr(request.state, "user_id", None)
+            if user_id is None:
+                user_id = await validate_token(token, db, get_id=True, ops=ops)
             kwargs.pop("token", None)
             if get_id:
                 kwargs["user_id"] = user_id
@@ -1,16 +1,22 @@
 # External imports
 from typing import Dict, Any
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+)
+from pydantic import ValidationError
 from uuid import UUID
+import hashlib
 
 # Internal imports
-from app.db_setup import get_db
 from app.api.logger.logger import get_logger
-from app.api.v1.database.operations import DatabaseOperations
+from app.api.v1.database.operations import DatabaseOperations, get_db_ops
 from app.api.v1.endpoints.token_validation import get_token, requires_auth
-from app.api.v1.endpoints.rate_limiting import rate_limit
-from app.api.v1.email.email_services import EmailServices
+from app.api.v1.email.email_services import email_services
 from app.api.v1.validation.schemas import (
     UserCreate,
     UserUpdate,
@@ -25,177 +31,212 @@ from app.api.v1.validation.schemas import (
 logger = get_logger("app.api.endpoints.user")
 router = APIRouter(tags=["users"])
 
+# Fixed response bodies, encoded once at import.
+_MSG_EMAIL_TOKEN_CREATED = b'{"message":"Email token created successfully"}'
+_MSG_USER_UPDATED = b'{"message":"User information updated successfully"}'
+_MSG_LOGGED_OUT = b'{"message":"User logged out successfully"}'
+_MSG_DEACTIVATED = b'{"message":"User deactivated successfully"}'
+_MSG_REACTIVATED = b'{"message":"User reactivated successfully"}'
+_MSG_DELETED = b'{"message":"User deleted successfully"}'
+_MSG_RESET_EMAIL_SENT = b'{"message":"Password reset email sent successfully"}'
+
+
+def _message_response(body: bytes) -> Response:
+    """
+    Wraps a prebuilt body in a new response.
+    Not shared between requests since middleware and background tasks
+    modify the response object.
+    """
+    return Response(content=body, media_type="application/json")
+
 
-@router.post("/")
-@rate_limit(authenticated_limit=0, unauthenticated_limit=0)
+@router.post("/register")
 async def function1(
-    request: Request, user: UserCreate, db: Session = Depends(get_db)
-):
+    request: Request,
+    user: UserCreate,
+    background_tasks: BackgroundTasks,
+    ops: DatabaseOperations = Depends(get_db_ops),
+) -> Response:
     """Creates a email token in the database"""
-    logger.info(f"Registering new user with email: {str(user.email)[:5]}...")
-    token = DatabaseOperations(db).create_email_token(user)
-    EmailServices().send_activation_email(user.email, token)
-    return {"message": "Email token created successfully"}
+    logger.info("Registering new user with email: %.5s...", user.email)
+    token = await ops.create_email_token(user)
+    # Sent after the response so the client doesn't wait on the email api
+    background_tasks.add_task(
+        email_services.send_activation_email, user.email, token
+    )
+    return _message_response(_MSG_EMAIL_TOKEN_CREATED)
 
 
-@router.post("/{token}")
-@rate_limit(authenticated_limit=0, unauthenticated_limit=0)
+@router.post("/verify/{token}")
 async def function2(
     request: Request,
     token: str,
-    db: Session = Depends(get_db),
+    ops: DatabaseOperations = Depends(get_db_ops),
 ):
     """Verify an email token and create a user in db"""
-    logger.info(f"Received token verification request. Token: {token[:10]}...")
-    token_data = EmailToken(token=token)
+    logger.info("Received token verification request. Token: %.10s...", token)
+    try:
+        token_data = EmailToken(token=token)
+    except ValidationError:
+        raise HTTPException(status_code=400, detail="Invalid token format")
     logger.info("Token format validated successfully")
 
-    auth_token = DatabaseOperations(db).create_user(token_data.token)
+    auth_token = await ops.create_user(token_data.token)
     logger.info("User created and authenticated successfully")
     return auth_token
 
 
-@router.post("/")
-@rate_limit(authenticated_limit=0, unauthenticated_limit=0)
+@router.post("/login")
 async def function3(
-    request: Request, user: UserLogin, db: Session = Depends(get_db)
+    request: Request,
+    user: UserLogin,
+    ops: DatabaseOperations = Depends(get_db_ops),
 ):
     """Login a user with email and password"""
     logger.info(
-        f"Login User endpoint requested with email: {str(user.email)[:5]}..."
+        "Login User endpoint requested with email: %.5s...", user.email
     )
-    token = DatabaseOperations(db).login_user(user)
+    token = await ops.login_user(user)
     logger.info(
-        f"Successfully logged in user with email: {user.email[:5]}... "
-        "Returning token to client."
+        "Successfully logged in user with email: %.5s... "
+        "Returning token to client.",
+        user.email,
     )
     return {"token": token}
 
 
-@router.put("/")
+@router.put("/update")
 @requires_auth(get_id=True)
-@rate_limit(authenticated_limit=0, unauthenticated_limit=0)
 async def function4(
     request: Request,
     user: UserUpdate,
-    db: Session = Depends(get_db),
+    ops: DatabaseOperations = Depends(get_db_ops),
     token: str = Depends(get_token),
-    user_id: int = None,
-):
+    user_id: UUID = None,
+) -> Response:
     """Update a user's information"""
+    logger.info("Updating user information for user ID: %.10s...", user_id)
+    await ops.update_user(user_id, user)
     logger.info(
-        f"Updating user information for user ID: {str(user_id)[:10]}..."
+        "Successfully updated user information for user ID: %.10s...",
+        user_id,
     )
-    DatabaseOperations(db).update_user(user_id, user)
-    logger.info(
-        f"Successfully updated user information for user ID: {str(user_id)[:10]}..."
-    )
-    return {"message": "User information updated successfully"}
+    return _message_response(_MSG_USER_UPDATED)
 
 
-@router.delete("/")
+@router.delete("/logout")
 @requires_auth(get_id=True)
-@rate_limit(authenticated_limit=0, unauthenticated_limit=0)
 async def function5(
     request: Request,
-    db: Session = Depends(get_db),
+    ops: DatabaseOperations = Depends(get_db_ops),
     token: str = Depends(get_token),
-    user_id: int = None,
-) -> Dict[str, str]:
+    user_id: UUID = None,
+) -> Response:
     """Logout a user"""
-    logger.info(f"Logging out user ID: {str(user_id)[:10]}...")
-    DatabaseOperations(db).logout_user(user_id)
-    return {"message": "User logged out successfully"}
+    logger.info("Logging out user ID: %.10s...", user_id)
+    await ops.logout_user(user_id)
+    return _message_response(_MSG_LOGGED_OUT)
 
 
-@router.put("/")
+@router.put("/deactivate")
 @requires_auth(get_id=True)
-@rate_limit(authenticated_limit=0, unauthenticated_limit=0)
 async def function6(
     request: Request,
-    db: Session = Depends(get_db),
+    ops: DatabaseOperations = Depends(get_db_ops),
     token: str = Depends(get_token),
-    user_id: int = None,
-) -> Dict[str, str]:
+    user_id: UUID = None,
+) -> Response:
     """Marks a user as inactive in the database"""
-    logger.info(f"Deactivating user ID: {str(user_id)[:10]}...")
-    DatabaseOperations(db).deactivate_user(user_id)
-    return {"message": "User deactivated successfully"}
+    logger.info("Deactivating user ID: %.10s...", user_id)
+    await ops.deactivate_user(user_id)
+    return _message_response(_MSG_DEACTIVATED)
 
 
-@router.put("/")
+@router.put("/reactivate")
 @requires_auth(get_id=True)
-@rate_limit(authenticated_limit=0, unauthenticated_limit=0)
 async def function7(
     request: Request,
-    db: Session = Depends(get_db),
+    ops: DatabaseOperations = Depends(get_db_ops),
     token: str = Depends(get_token),
-    user_id: int = None,
-) -> Dict[str, str]:
+    user_id: UUID = None,
+) -> Response:
     """Reactivates a user in the database"""
-    logger.info(f"Reactivating user ID: {str(user_id)[:10]}...")
-    DatabaseOperations(db).activate_user(user_id)
-    return {"message": "User reactivated successfully"}
+    logger.info("Reactivating user ID: %.10s...", user_id)
+    await ops.activate_user(user_id)
+    return _message_response(_MSG_REACTIVATED)
 
 
-@router.delete("/")
+@router.delete("/hard-delete")
 @requires_auth(get_id=True)
-@rate_limit(authenticated_limit=0, unauthenticated_limit=0)
 async def function8(
     request: Request,
-    db: Session = Depends(get_db),
+    ops: DatabaseOperations = Depends(get_db_ops),
     token: str = Depends(get_token),
-    user_id: int = None,
-) -> Dict[str, str]:
+    user_id: UUID = None,
+) -> Response:
     """Deletes the users row in the database"""
-    logger.info(f"Deleting user ID: {str(user_id)[:10]}...")
-    DatabaseOperations(db).hard_delete_user(user_id)
-    return {"message": "User deleted successfully"}
+    logger.info("Deleting user ID: %.10s...", user_id)
+    await ops.hard_delete_user(user_id)
+    return _message_response(_MSG_DELETED)
 
 
-@router.get("/", response_model=UserProfileResponse)
+@router.get("/profile", response_model=UserProfileResponse)
 @requires_auth(get_id=True)
-@rate_limit(authenticated_limit=0, unauthenticated_limit=0)
 async def function9(
     request: Request,
-    db: Session = Depends(get_db),
+    response: Response,
+    ops: DatabaseOperations = Depends(get_db_ops),
     token: str = Depends(get_token),
     user_id: UUID = None,
 ) -> Dict[str, Any]:
     """Returns the user's profile information"""
-    logger.info(f"Getting user profile for user ID: {str(user_id)[:10]}...")
-    user: Dict[str, Any] = DatabaseOperations(db).get_user_profile(user_id)
+    logger.info("Getting user profile for user ID: %.10s...", user_id)
+    user: Dict[str, Any] = await ops.get_user_profile(user_id)
+    # Weak etag over the profile fields, lets clients revalidate with 304
+    digest = hashlib.sha256(repr(sorted(user.items())).encode()).hexdigest()
+    etag = f'W/"{digest[:16]}"'
+    # Weak comparison: compare the opaque tags with any W/ prefix stripped
+    if_none_match = request.headers.get("if-none-match", "")
+    client_tags = {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }
+    if "*" in client_tags or etag.removeprefix("W/") in client_tags:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return user
 
 
-@router.post("/")
-@rate_limit(authenticated_limit=0, unauthenticated_limit=0)
+@router.post("/password-reset")
 async def function10(
     request: Request,
     user: UserEmail,
-    db: Session = Depends(get_db),
-) -> Dict[str, str]:
+    background_tasks: BackgroundTasks,
+    ops: DatabaseOperations = Depends(get_db_ops),
+) -> Response:
     """Sends out a link for password reset"""
-    logger.info(f"Email: '{user.email[:5]}...' requested a password reset")
-    email_token = DatabaseOperations(db).update_email_token(user.email)
-    EmailServices().send_reset_email(user.email, email_token)
-    return {"message": "Password reset email sent successfully"}
+    logger.info("Email: '%.5s...' requested a password reset", user.email)
+    email_token = await ops.update_email_token(user.email)
+    # Sent after the response so the client doesn't wait on the email api
+    background_tasks.add_task(
+        email_services.send_reset_email, user.email, email_token
+    )
+    return _message_response(_MSG_RESET_EMAIL_SENT)
 
 
-@router.post("/{token}")
-@rate_limit(authenticated_limit=0, unauthenticated_limit=0)
+@router.post("/password-reset/{token}")
 async def function11(
     request: Request,
+    token: str,
     data: PasswordReset,
-    db: Session = Depends(get_db),
+    ops: DatabaseOperations = Depends(get_db_ops),
 ) -> Dict[str, str]:
     """Resets a user's password"""
-    logger.info(
-        f"Resetting password for email token: {data.email_token[:10]}..."
-    )
-    user = DatabaseOperations(db).reset_password(
-        data.email_token, data.new_password
+    logger.info("Resetting password for email token: %.10s...", token)
+    try:
+        token_data = EmailToken(token=token)
+    except ValidationError:
+        raise HTTPException(status_code=400, detail="Invalid token format")
+    auth_token = await ops.reset_password_and_issue_token(
+        token_data.token, data.new_password
     )
-    user_data = UserLogin(email=user.email, password=data.new_password)
-    auth_token = DatabaseOperations(db).login_user(user_data)
     return {"token": auth_token}
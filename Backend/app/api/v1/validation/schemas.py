@@ -1,5 +1,14 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, StringConstraints
+from typing import Annotated, Optional
+
+# Email tokens are url-safe base64 (43 chars as generated).
+# Checked by pydantic-core so malformed tokens never reach the db.
+EmailTokenStr = Annotated[
+    str,
+    StringConstraints(
+        min_length=32, max_length=64, pattern=r"^[A-Za-z0-9_-]+$"
+    ),
+]
 
 
 class StartingStory(BaseModel):
@@ -54,9 +63,9 @@ class UserProfileResponse(BaseModel):
 
 
 class EmailToken(BaseModel):
-    token: str
+    token: EmailTokenStr
 
 
 class PasswordReset(BaseModel):
+    # The email token comes from the /password-reset/{token} path
     new_password: str
-    email_token: str
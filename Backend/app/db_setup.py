@@ -1,47 +1,213 @@
 # External imports
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+import asyncio
+from sqlalchemy import Index, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 # Internal imports
-from app.api.v1.database.models import Base
+from app.api.v1.database.models import Base, RateLimit, Table
 from app.settings import settings
 from app.api.logger.logger import get_logger
 
 db_setup_logger = get_logger("app.database.setup")
 
-url = settings.DB_URL
+# The async engine needs the asyncpg driver in the connection string.
+# Swapping the drivername also covers urls that name a sync driver,
+# e.g. postgresql+psycopg2://, which create_async_engine would reject.
+url = make_url(settings.DB_URL).set(drivername="postgresql+asyncpg")
+
+# Every worker has its own pool, so each gets an equal share of
+# DB_MAX_CONNECTIONS and the configured sizes are lowered to fit it.
+connections_per_worker = settings.DB_MAX_CONNECTIONS // settings.worker_count
+if connections_per_worker < 1:
+    raise RuntimeError(
+        f"DB_MAX_CONNECTIONS={settings.DB_MAX_CONNECTIONS} leaves no "
+        f"connection for each of the {settings.worker_count} workers"
+    )
+pool_size = min(settings.DB_POOL_SIZE, connections_per_worker)
+max_overflow = min(
+    settings.DB_MAX_OVERFLOW, connections_per_worker - pool_size
+)
 
 try:
-    engine = create_engine(f"{url}", echo=True)
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
+    SessionLocal = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
     db_setup_logger.info("Database engine created successfully")
 except Exception as e:
     db_setup_logger.error(f"Error creating database engine: {str(e)}")
 
 
-def init_db():
+# Advisory lock key held by init_db, so only one worker at a time
+# creates tables and runs the migrations below.
+INIT_DB_LOCK_ID = 0x416476414921  # "AdvAI!"
+
+# Unique indexes the ON CONFLICT upserts rely on.
+# Declaring them attaches them to their tables, so create_all builds them
+# for new databases. init_db adds them to databases that predate them.
+UPSERT_INDEXES = [
+    # One access token per user, _create_access_token upserts on user_id
+    Index("uq_access_token_user_id", Table.column, unique=True),  # user_id
+    # One pending registration per email, _post_email_token upserts on email
+    Index("uq_email_token_email", Table.column, unique=True),  # email
+    Index(
+        "uq_rate_limit_user_path",
+        RateLimit.user_id,
+        RateLimit.endpoint_path,
+        unique=True,
+        postgresql_where=RateLimit.user_id.isnot(None),
+    ),
+    Index(
+        "uq_rate_limit_ip_path",
+        RateLimit.ip_address,
+        RateLimit.endpoint_path,
+        unique=True,
+        postgresql_where=RateLimit.ip_address.isnot(None),
+    ),
+]
+
+
+def _migrate_access_token_hash(conn):
+    """
+    Moves access tokens from the plain text token column to token_hash,
+    the SHA-256 digest validate_token looks up.
+    Existing tokens are hashed in place so nobody gets logged out.
+    Skipped once the token column is gone. Needs Postgres 11+ for sha256().
+    """
+    table_name = Table.__tablename__
+    columns = {c["name"] for c in inspect(conn).get_columns(table_name)}
+    if "token" not in columns:
+        return
+    table = conn.dialect.identifier_preparer.quote(table_name)
+    if "token_hash" not in columns:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN token_hash bytea"))
+    conn.execute(
+        text(
+            f"UPDATE {table} "
+            "SET token_hash = sha256(convert_to(token, 'UTF8')) "
+            "WHERE token_hash IS NULL"
+        )
+    )
+    conn.execute(text(f"ALTER TABLE {table} DROP COLUMN token"))
+    db_setup_logger.info("Migrated access tokens to token_hash")
+
+
+def _create_missing_indexes(conn):
+    """
+    Creates the upsert indexes that don't exist yet.
+    Duplicate rows left by older code are removed first,
+    keeping one row per key, or the unique index could not be built.
+    """
+    inspector = inspect(conn)
+    quote = conn.dialect.identifier_preparer.quote
+    for index in UPSERT_INDEXES:
+        table_name = index.table.name
+        existing = {i["name"] for i in inspector.get_indexes(table_name)}
+        if index.name in existing:
+            continue
+        same_key = " AND ".join(
+            f"a.{quote(c.name)} = b.{quote(c.name)}" for c in index.columns
+        )
+        table = quote(table_name)
+        conn.execute(
+            text(
+                f"DELETE FROM {table} a USING {table} b "
+                f"WHERE a.ctid < b.ctid AND {same_key}"
+            )
+        )
+        index.create(conn)
+        db_setup_logger.info(f"Created index {index.name}")
+
+
+async def init_db():
     """
     Called when main.py is run.
-    Creates all tables in the database.
+    Creates all tables in the database,
+    then brings tables from older versions up to date.
     """
     try:
         db_setup_logger.info("Attempting to create all database tables...")
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            # Every worker runs this on startup. The lock is released on
+            # commit, the workers that waited then find nothing left to do.
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(:id)"),
+                {"id": INIT_DB_LOCK_ID},
+            )
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_migrate_access_token_hash)
+            await conn.run_sync(_create_missing_indexes)
         db_setup_logger.info("Database tables created successfully")
     except Exception as e:
         db_setup_logger.error(f"Error creating database tables: {str(e)}")
 
 
-def get_db():
+async def warm_up_pool():
     """
-    Returns a session to the database.
-    Used when changes are made to the db during runtime.
+    Called on startup after init_db.
+    Opens pool_size connections at once and pings them,
+    so the first requests don't pay for the connection handshake.
     """
-    db_setup_logger.debug("Creating new database session")
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
     try:
-        with Session(engine, expire_on_commit=False) as session:
-            db_setup_logger.debug("Database session created")
-            yield session
-            db_setup_logger.debug("Database session closed")
+        await asyncio.gather(*(ping() for _ in range(engine.pool.size())))
+        db_setup_logger.info("Database connection pool warmed up")
     except Exception as e:
-        db_setup_logger.error(f"Error in database session: {str(e)}")
-        raise
+        db_setup_logger.error(f"Error warming up connection pool: {str(e)}")
+
+
+class SessionManager:
+    """
+    Async context manager around a database session.
+    Rolls back on errors and returns the connection to the pool on exit,
+    so it is released as soon as the block ends.
+    Usage: async with SessionManager() as db: ...
+    """
+
+    def __init__(self):
+        self.session = None
+
+    async def __aenter__(self) -> AsyncSession:
+        self.session = SessionLocal()
+        db_setup_logger.debug("Database session created")
+        return self.session
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is not None:
+                db_setup_logger.error(
+                    f"Error in database session: {str(exc_value)}"
+                )
+                await self.session.rollback()
+        finally:
+            await self.session.close()
+            db_setup_logger.debug("Database session closed")
+
+
+async def get_db():
+    """
+    Returns an async session to the database.
+    Used when changes are made to the db during runtime.
+    """
+    async with SessionManager() as session:
+        yield session
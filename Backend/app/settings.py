@@ -4,6 +4,7 @@ Make sure your env file has all of these below.
 Import 'settings' (the instance, not the class) into other modules.
 """
 
+import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -23,5 +24,50 @@ class Settings(BaseSettings):
     START_LAMBDA_NAME: str
     REGION: str
 
+    # "dev" runs main.py with reload, anything else with workers.
+    ENV: str = "dev"
+    PORT: int = 8000
+    # Server processes sharing this host and database, in any ENV.
+    # Under supervisor set it to the number of processes it starts.
+    # 0 means 1 in dev and 2 * cores + 1 otherwise.
+    # The pool and hashing budgets below are divided by it.
+    WORKERS: int = 0
+
+    # Connections all workers together may open, keep it under
+    # Postgres max_connections. Each worker gets an equal share.
+    DB_MAX_CONNECTIONS: int = 90
+    # Upper bounds per worker, lowered to fit the share above.
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    DB_ECHO: bool = False
+
+    # Requests per window and path, applied by RateLimitMiddleware.
+    RATE_LIMIT_AUTHENTICATED: int = 100
+    RATE_LIMIT_UNAUTHENTICATED: int = 20
+    RATE_LIMIT_WINDOW_SECONDS: int = 60
+
+    # Seconds a validated access token is trusted without the db.
+    # The cache is per worker, a revoked token lives this long elsewhere.
+    TOKEN_CACHE_TTL: int = 5
+
+    # Argon2id cost, memory is in KiB. Defaults are the OWASP minimum.
+    PASSWORD_TIME_COST: int = 1
+    PASSWORD_MEMORY_COST: int = 46 * 1024
+    PASSWORD_PARALLELISM: int = 1
+    # Hashing threads per worker process, 0 splits the cores between workers.
+    # Each running hash holds the memory cost.
+    PASSWORD_HASH_WORKERS: int = 0
+
+    @property
+    def worker_count(self) -> int:
+        """Number of server processes sharing this host and database."""
+        if self.WORKERS:
+            return self.WORKERS
+        if self.ENV == "dev":
+            return 1
+        return (os.cpu_count() or 1) * 2 + 1
+
 
 settings = Settings()
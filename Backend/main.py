@@ -8,11 +8,15 @@ In production we use supervisor but still grap app and lifespan from here.
 import uvicorn
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # Internal imports
 from app.api.v1.routers import router as game_router
-from app.db_setup import init_db
+from app.db_setup import init_db, warm_up_pool
+from app.settings import settings
+from app.api.v1.email.email_services import EmailServices
+from app.api.v1.endpoints.rate_limiting import RateLimitMiddleware
 from app.api.logger.logger import get_logger
 
 app_logger = get_logger("app.main")
@@ -21,27 +25,59 @@ app_logger = get_logger("app.main")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app_logger.info("Application starting up - initializing database")
-    init_db()
+    await init_db()
     app_logger.info("Database initialized successfully")
+    await warm_up_pool()
     yield
     app_logger.info("Application shutting down")
+    await EmailServices.close()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 app_logger.info("FastAPI application created")
 
+# Added before CORS so CORS stays outermost
+# and 429 responses still carry the CORS headers.
+app.add_middleware(
+    RateLimitMiddleware,
+    routes=app.routes,
+    authenticated_limit=settings.RATE_LIMIT_AUTHENTICATED,
+    unauthenticated_limit=settings.RATE_LIMIT_UNAUTHENTICATED,
+    window_seconds=settings.RATE_LIMIT_WINDOW_SECONDS,
+)
+app_logger.info("Rate limit middleware configured")
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["adventureai.world"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    expose_headers=[
+        "ETag",
+        "X-RateLimit-Limit",
+        "X-RateLimit-Remaining",
+        "X-RateLimit-Reset",
+        "Retry-After",
+    ],
 )
 app_logger.info("CORS middleware configured")
 app.include_router(game_router)
 app_logger.info("API routes registered")
 
 if __name__ == "__main__":
-    # Only during local development
     app_logger.info("Starting uvicorn server")
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    if settings.ENV == "dev":
+        uvicorn.run(
+            "main:app", host="0.0.0.0", port=settings.PORT, reload=True
+        )
+    else:
+        # Each worker gets its own db pool, sized from DB_MAX_CONNECTIONS
+        workers = settings.worker_count
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=settings.PORT,
+            workers=workers,
+            loop="uvloop",
+            http="httptools",
+        )